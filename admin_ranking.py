@@ -7,6 +7,71 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional
 from data_fetcher import AdminDataFetcher
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _window_mean_loop(codes: np.ndarray, values: np.ndarray,
+                      n_groups: int, cap: int) -> np.ndarray:
+    """
+    Mean of values over the first `cap` rows per group code.
+
+    Expects rows sorted by created_at descending, so the first `cap`
+    occurrences of each code are the most recent records. Null values
+    count towards the window but not towards the mean, matching
+    head(cap) followed by dropna().mean(). Groups with no valid values
+    yield NaN.
+    """
+    sums = np.zeros(n_groups)
+    counts = np.zeros(n_groups, np.int64)
+    seen = np.zeros(n_groups, np.int64)
+    for k in range(codes.shape[0]):
+        c = codes[k]
+        if seen[c] >= cap:
+            continue
+        seen[c] += 1
+        v = values[k]
+        if not np.isnan(v):
+            sums[c] += v
+            counts[c] += 1
+    means = np.full(n_groups, np.nan)
+    for c in range(n_groups):
+        if counts[c] > 0:
+            means[c] = sums[c] / counts[c]
+    return means
+
+
+def _window_mean_bincount(codes: np.ndarray, values: np.ndarray,
+                          n_groups: int, cap: int) -> np.ndarray:
+    """
+    NumPy implementation of _window_mean_loop with the same contract.
+
+    Branchless vector ops: the per-group occurrence rank marks the
+    cap-window, an isfinite mask drops nulls, and bincount accumulates
+    sum and count per group in one pass each.
+    """
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    group_sizes = np.bincount(sorted_codes, minlength=n_groups)
+    starts = np.repeat(np.cumsum(group_sizes) - group_sizes, group_sizes)
+    occurrence = np.empty(len(codes), np.int64)
+    occurrence[order] = np.arange(len(codes)) - starts
+
+    mask = (occurrence < cap) & np.isfinite(values)
+    sums = np.bincount(codes[mask], weights=values[mask], minlength=n_groups)
+    counts = np.bincount(codes[mask], minlength=n_groups)
+    means = np.full(n_groups, np.nan)
+    np.divide(sums, counts, out=means, where=counts > 0)
+    return means
+
+
+if njit is not None:
+    _window_mean = njit(cache=True)(_window_mean_loop)
+else:
+    _window_mean = _window_mean_bincount
+
 
 class AdminRanking:
     """Calculates admin rankings using lambda formula."""
@@ -16,7 +81,45 @@ class AdminRanking:
         self.data_fetcher = AdminDataFetcher()
         self.recent_calls_limit = 50
         self.recent_ratings_limit = 50
-    
+        self._call_idx = {}
+        self._rating_idx = {}
+        self._leave_counts = {}
+
+    def _prepare_indices(self, call_data: pd.DataFrame, rating_data: pd.DataFrame,
+                         leave_data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Sort each table once and cache admin_id -> row-position buckets,
+        plus the leave-request count per admin.
+
+        One global sort plus one hash-partition pass per table replaces a
+        full-column equality scan and a per-admin sort in every calculate_*
+        call: with the frames pre-sorted by created_at descending, the first
+        positions of each bucket are already the most recent records.
+
+        Args:
+            call_data: DataFrame with call data
+            rating_data: DataFrame with rating data
+            leave_data: DataFrame with leave request data
+
+        Returns:
+            Tuple of (call_data, rating_data) sorted by created_at descending
+        """
+        if not call_data.empty:
+            call_data = call_data.sort_values('created_at', ascending=False, kind='stable')
+            self._call_idx = call_data.groupby('admin_id', sort=False, observed=True).indices
+        else:
+            self._call_idx = {}
+        if not rating_data.empty:
+            rating_data = rating_data.sort_values('created_at', ascending=False, kind='stable')
+            self._rating_idx = rating_data.groupby('user_id', sort=False, observed=True).indices
+        else:
+            self._rating_idx = {}
+        if not leave_data.empty and 'user_id' in leave_data.columns:
+            self._leave_counts = leave_data['user_id'].value_counts().to_dict()
+        else:
+            self._leave_counts = {}
+        return call_data, rating_data
+
     def calculate_cr50(self, call_data: pd.DataFrame, admin_id: str) -> float:
         """
         Calculate cr50: average internal_rating for last 50 calls per admin.
@@ -28,14 +131,13 @@ class AdminRanking:
         Returns:
             Average internal rating for last 50 calls
         """
-        admin_calls = call_data[call_data['admin_id'] == admin_id].copy()
-        
-        if admin_calls.empty:
+        idx = self._call_idx.get(admin_id)
+        if idx is None:
             return 0.0
-        
-        # Sort by created_at descending and take last 50
-        admin_calls = admin_calls.sort_values('created_at', ascending=False).head(self.recent_calls_limit)
-        
+        # Frame is pre-sorted by created_at descending, so the first
+        # positions in the bucket are the most recent calls
+        admin_calls = call_data.take(idx[:self.recent_calls_limit])
+
         # Filter out null internal_rating values
         valid_ratings = admin_calls['internal_rating'].dropna()
         
@@ -55,14 +157,13 @@ class AdminRanking:
         Returns:
             Inverse of average credentials delivery time for last 50 calls
         """
-        admin_calls = call_data[call_data['admin_id'] == admin_id].copy()
-        
-        if admin_calls.empty:
+        idx = self._call_idx.get(admin_id)
+        if idx is None:
             return 0.0
-        
-        # Sort by created_at descending and take last 50
-        admin_calls = admin_calls.sort_values('created_at', ascending=False).head(self.recent_calls_limit)
-        
+        # Frame is pre-sorted by created_at descending, so the first
+        # positions in the bucket are the most recent calls
+        admin_calls = call_data.take(idx[:self.recent_calls_limit])
+
         # Filter out null credentials_delivery_time values
         valid_times = admin_calls['credentials_delivery_time'].dropna()
         
@@ -83,14 +184,13 @@ class AdminRanking:
         Returns:
             Average chat rating for last 50 ratings
         """
-        admin_ratings = rating_data[rating_data['user_id'] == admin_id].copy()
-        
-        if admin_ratings.empty:
+        idx = self._rating_idx.get(admin_id)
+        if idx is None:
             return 0.0
-        
-        # Sort by created_at descending and take last 50
-        admin_ratings = admin_ratings.sort_values('created_at', ascending=False).head(self.recent_ratings_limit)
-        
+        # Frame is pre-sorted by created_at descending, so the first
+        # positions in the bucket are the most recent ratings
+        admin_ratings = rating_data.take(idx[:self.recent_ratings_limit])
+
         # Filter out null rating values
         valid_ratings = admin_ratings['rating'].dropna()
         
@@ -110,15 +210,8 @@ class AdminRanking:
         Returns:
             Inverse of leave requests count in last month
         """
-        if leave_data.empty or 'user_id' not in leave_data.columns:
-            # No leave requests data at all
-            return 1.0
-        admin_leaves = leave_data[leave_data['user_id'] == admin_id].copy()
-        if admin_leaves.empty:
-            # No leave requests means high availability - return high score
-            return 1.0
-        leave_count = len(admin_leaves)
-        # If no leaves, return 1.0 (high score)
+        leave_count = self._leave_counts.get(admin_id, 0)
+        # No leaves means high availability - return 1.0 (high score)
         # If leaves exist, return inverse (more leaves = lower score)
         return 1.0 / (leave_count + 1) if leave_count > 0 else 1.0
     
@@ -136,6 +229,8 @@ class AdminRanking:
         Returns:
             Dictionary with component scores and final lambda score
         """
+        call_data, rating_data = self._prepare_indices(call_data, rating_data, leave_data)
+
         cr50 = self.calculate_cr50(call_data, admin_id)
         cdt50_inverse = self.calculate_cdt50(call_data, admin_id)
         r50 = self.calculate_r50(rating_data, admin_id)
@@ -152,50 +247,136 @@ class AdminRanking:
             'lambda_score': lambda_score
         }
     
+    def _compact_rankings(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Downcast metric columns to float32 and consolidate blocks.
+
+        Arrow-based writers (parquet, CSV) convert contiguous
+        native-dtype columns without a defensive copy, so every
+        downstream save of the rankings gets cheaper; the final .copy()
+        leaves the frame in one consolidated block.
+
+        Args:
+            df: Finished rankings DataFrame
+
+        Returns:
+            The same rankings with float32 metrics in consolidated blocks
+        """
+        metric_columns = ['lambda_score', 'cr50', 'cdt50_inverse', 'r50', 'lr1m_inverse']
+        df[metric_columns] = df[metric_columns].astype('float32')
+        return df.copy()
+
+    def _rank_from_aggregates(self, agg_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build the ranking frame from per-admin aggregates (cr50, cdt50,
+        r50, lr1m), applying the inverses and lambda formula.
+
+        Args:
+            agg_df: DataFrame with one row per admin of raw aggregates
+
+        Returns:
+            DataFrame with admin rankings sorted by lambda score (descending)
+        """
+        df = agg_df.copy()
+        df['cr50'] = df['cr50'].fillna(0.0)
+        df['cdt50_inverse'] = (1.0 / df['cdt50']).where(df['cdt50'] > 0).fillna(0.0)
+        df['r50'] = df['r50'].fillna(0.0)
+        df['lr1m_inverse'] = 1.0 / (df['lr1m'].fillna(0) + 1.0)
+        df['lambda_score'] = df['cr50'] + df['cdt50_inverse'] + df['r50'] + df['lr1m_inverse']
+
+        df = df[['admin_id', 'cr50', 'cdt50_inverse', 'r50', 'lr1m_inverse',
+                 'lambda_score', 'admin_name']]
+        df = df.sort_values('lambda_score', ascending=False).reset_index(drop=True)
+        df['rank'] = df.index + 1
+
+        return self._compact_rankings(df)
+
     def rank_all_admins(self) -> pd.DataFrame:
         """
         Calculate lambda scores for all admins and return ranked results.
-        
+
         Returns:
             DataFrame with admin rankings sorted by lambda score (descending)
         """
+        # Prefer the server-side aggregates: one row per admin on the wire
+        # and no raw-record processing in Python
+        server_agg = self.data_fetcher.get_rankings()
+        if not server_agg.empty:
+            return self._rank_from_aggregates(server_agg)
+
         print("Fetching data from all tables...")
-        
-        # Fetch all data
-        call_data = self.data_fetcher.get_all_call_data()
-        rating_data = self.data_fetcher.get_all_chat_ratings()
-        leave_data = self.data_fetcher.get_all_leave_requests()
-        
+
+        # Fetch all data in a single round-trip
+        bundle = self.data_fetcher.fetch_all_bundle()
+        call_data = bundle['calls']
+        rating_data = bundle['ratings']
+        leave_data = bundle['leaves']
+
         if call_data.empty:
             print("No call data available for ranking")
             return pd.DataFrame()
-        
-        # Get unique admin IDs from call data
-        admin_ids = call_data['admin_id'].unique()
+
+        # Aggregate all metrics in one pass per table: sort once, then run
+        # the window-mean kernel (numba loop or numpy bincount) over the
+        # categorical codes
+        call_data = call_data.sort_values('created_at', ascending=False)
+        codes = call_data['admin_id'].cat.codes.to_numpy(np.int64)
+        categories = call_data['admin_id'].cat.categories
+        ratings = call_data['internal_rating'].to_numpy(np.float64)
+        times = call_data['credentials_delivery_time'].to_numpy(np.float64)
+        call_agg = pd.DataFrame({
+            'cr50': _window_mean(codes, ratings, len(categories), self.recent_calls_limit),
+            'cdt50': _window_mean(codes, times, len(categories), self.recent_calls_limit)
+        }, index=categories)
+
+        admin_ids = call_agg.index
         print(f"Found {len(admin_ids)} unique admins")
-        
-        # Calculate lambda scores for each admin
-        results = []
-        for i, admin_id in enumerate(admin_ids, 1):
-            print(f"Processing admin {i}/{len(admin_ids)}: {admin_id}")
-            
-            score_data = self.calculate_lambda_score(
-                call_data, rating_data, leave_data, admin_id
+
+        if not rating_data.empty:
+            rating_data = rating_data.sort_values('created_at', ascending=False)
+            codes = rating_data['user_id'].cat.codes.to_numpy(np.int64)
+            rating_categories = rating_data['user_id'].cat.categories
+            values = rating_data['rating'].to_numpy(np.float64)
+            r50 = pd.Series(
+                _window_mean(codes, values, len(rating_categories), self.recent_ratings_limit),
+                index=rating_categories
             )
-            
-            # Get admin name from call data
-            admin_name = call_data[call_data['admin_id'] == admin_id]['admin_name'].iloc[0] \
-                        if not call_data[call_data['admin_id'] == admin_id].empty else 'Unknown'
-            
-            score_data['admin_name'] = admin_name
-            results.append(score_data)
-        
-        # Create DataFrame and sort by lambda score
-        results_df = pd.DataFrame(results)
+        else:
+            r50 = pd.Series(dtype=float)
+
+        if not leave_data.empty and 'user_id' in leave_data.columns:
+            leave_counts = leave_data.groupby('user_id', sort=False, observed=True).size()
+        else:
+            leave_counts = pd.Series(dtype=int)
+
+        # Component scores as vectorized Series arithmetic
+        cr50 = call_agg['cr50'].fillna(0.0)
+        cdt50_inverse = (1.0 / call_agg['cdt50']).where(call_agg['cdt50'] > 0).fillna(0.0)
+        r50 = r50.reindex(admin_ids).fillna(0.0)
+        lr1m_inverse = 1.0 / (leave_counts.reindex(admin_ids).fillna(0) + 1.0)
+
+        # One dict lookup per admin instead of re-filtering the call frame
+        name_map = call_data.drop_duplicates('admin_id') \
+                            .set_index('admin_id')['admin_name'].to_dict()
+
+        # Column-bind the per-admin Series; no per-admin Python work
+        results_df = pd.DataFrame({
+            'cr50': cr50,
+            'cdt50_inverse': cdt50_inverse,
+            'r50': r50,
+            'lr1m_inverse': lr1m_inverse
+        })
+        results_df['lambda_score'] = (results_df['cr50'] + results_df['cdt50_inverse'] +
+                                      results_df['r50'] + results_df['lr1m_inverse'])
+        results_df.index.name = 'admin_id'
+        results_df = results_df.reset_index()
+        results_df['admin_name'] = results_df['admin_id'].map(name_map).fillna('Unknown')
+
+        # Sort by lambda score
         results_df = results_df.sort_values('lambda_score', ascending=False).reset_index(drop=True)
         results_df['rank'] = results_df.index + 1
-        
-        return results_df
+
+        return self._compact_rankings(results_df)
     
     def get_top_admins(self, top_n: int = 10) -> pd.DataFrame:
         """
@@ -221,18 +402,23 @@ class AdminRanking:
             Dictionary with detailed metrics and recent records
         """
         print(f"Fetching detailed analysis for admin: {admin_id}")
-        
-        # Fetch all data
-        call_data = self.data_fetcher.get_all_call_data()
-        rating_data = self.data_fetcher.get_all_chat_ratings()
-        leave_data = self.data_fetcher.get_all_leave_requests()
-        
-        # Calculate lambda score
+
+        # Fetch all data in a single round-trip
+        bundle = self.data_fetcher.fetch_all_bundle()
+        call_data = bundle['calls']
+        rating_data = bundle['ratings']
+        leave_data = bundle['leaves']
+        
+        # Calculate lambda score; this sorts the frames and builds the
+        # per-admin index buckets reused below
+        call_data, rating_data = self._prepare_indices(call_data, rating_data, leave_data)
         lambda_data = self.calculate_lambda_score(call_data, rating_data, leave_data, admin_id)
-        
-        # Get recent records for analysis
-        admin_calls = call_data[call_data['admin_id'] == admin_id].sort_values('created_at', ascending=False).head(50)
-        admin_ratings = rating_data[rating_data['user_id'] == admin_id].sort_values('created_at', ascending=False).head(50)
+
+        # Slice this admin's recent records straight from the buckets
+        call_idx = self._call_idx.get(admin_id)
+        admin_calls = call_data.take(call_idx[:50]) if call_idx is not None else call_data.iloc[0:0]
+        rating_idx = self._rating_idx.get(admin_id)
+        admin_ratings = rating_data.take(rating_idx[:50]) if rating_idx is not None else rating_data.iloc[0:0]
         if leave_data.empty or 'user_id' not in leave_data.columns:
             admin_leaves = pd.DataFrame()
         else:
@@ -79,6 +79,117 @@ query GetAllChatRatings($limit: Int!) {
 }
 """
 
+# Server-side "top 50 calls per admin" selection. Backed by a
+# Hasura-tracked SQL view so the payload is bounded by 50 rows per admin
+# instead of a flat limit shared across all admins:
+#
+#   CREATE VIEW whatsub_delivery_time_top50 AS
+#   SELECT id, admin_id, admin_name, internal_rating,
+#          credentials_delivery_time, created_at, call_status
+#   FROM (
+#     SELECT *, row_number() OVER (PARTITION BY admin_id
+#                                  ORDER BY created_at DESC) AS rn
+#     FROM whatsub_delivery_time WHERE admin_id IS NOT NULL
+#   ) t WHERE rn <= 50;
+TOP50_CALL_DATA_QUERY = """
+query GetTop50CallData {
+  whatsub_delivery_time_top50(order_by: {created_at: desc}) {
+    id
+    admin_id
+    admin_name
+    internal_rating
+    credentials_delivery_time
+    created_at
+    call_status
+  }
+}
+"""
+
+# Server-side rankings. Backed by a Hasura-tracked SQL view that computes
+# the per-admin window aggregates in Postgres, so only A rows cross the
+# wire instead of the raw records:
+#
+#   CREATE VIEW admin_ranking_v AS
+#   SELECT c.admin_id, c.admin_name, c.cr50, c.cdt50, r.r50, l.lr1m
+#   FROM (
+#     SELECT admin_id, max(admin_name) AS admin_name,
+#            avg(internal_rating) AS cr50,
+#            avg(credentials_delivery_time) AS cdt50
+#     FROM (
+#       SELECT *, row_number() OVER (PARTITION BY admin_id
+#                                    ORDER BY created_at DESC) AS rn
+#       FROM whatsub_delivery_time WHERE admin_id IS NOT NULL
+#     ) t WHERE rn <= 50 GROUP BY admin_id
+#   ) c
+#   LEFT JOIN (
+#     SELECT user_id, avg(rating) AS r50
+#     FROM (
+#       SELECT *, row_number() OVER (PARTITION BY user_id
+#                                    ORDER BY created_at DESC) AS rn
+#       FROM whatsub_admin_ratings WHERE user_id IS NOT NULL
+#     ) t WHERE rn <= 50 GROUP BY user_id
+#   ) r ON r.user_id = c.admin_id
+#   LEFT JOIN (
+#     SELECT user_id, count(*) AS lr1m
+#     FROM whatsub_room_user_mapping
+#     WHERE leave_request = true AND created_at >= now() - interval '30 days'
+#     GROUP BY user_id
+#   ) l ON l.user_id = c.admin_id;
+ADMIN_RANKINGS_QUERY = """
+query GetAdminRankings {
+  admin_ranking_v {
+    admin_id
+    admin_name
+    cr50
+    cdt50
+    r50
+    lr1m
+  }
+}
+"""
+
+COMBINED_DATA_QUERY = """
+query GetAllRankingData($limit: Int!) {
+  calls: whatsub_delivery_time(
+    where: {admin_id: {_is_null: false}}
+    order_by: {created_at: desc}
+    limit: $limit
+  ) {
+    id
+    admin_id
+    admin_name
+    internal_rating
+    credentials_delivery_time
+    created_at
+    call_status
+  }
+  ratings: whatsub_admin_ratings(
+    where: {user_id: {_is_null: false}}
+    order_by: {created_at: desc}
+    limit: $limit
+  ) {
+    id
+    user_id
+    rating
+    created_at
+    operation_status
+  }
+  leaves: whatsub_room_user_mapping(
+    where: {
+      leave_request: {_eq: true}
+      created_at: {_gte: "2026-01-12T00:00:00Z"}
+    }
+    order_by: {created_at: desc}
+  ) {
+    id
+    user_id
+    leave_request
+    leave_request_reason
+    created_at
+  }
+}
+"""
+
 LEAVE_REQUESTS_QUERY = """
 query GetLeaveRequests($user_id: uuid) {
   whatsub_room_user_mapping(
@@ -119,4 +230,10 @@ query GetAllLeaveRequests {
 # Configuration Parameters
 RECENT_CALLS_LIMIT = 50
 RECENT_RATINGS_LIMIT = 50
-DAYS_FOR_LEAVE_REQUESTS = 30
\ No newline at end of file
+DAYS_FOR_LEAVE_REQUESTS = 30
+
+# Set USE_TOP50_VIEW=true once whatsub_delivery_time_top50 is tracked in Hasura
+USE_TOP50_VIEW = os.getenv('USE_TOP50_VIEW', 'false').lower() == 'true'
+
+# Set USE_RANKING_VIEW=true once admin_ranking_v is tracked in Hasura
+USE_RANKING_VIEW = os.getenv('USE_RANKING_VIEW', 'false').lower() == 'true'
\ No newline at end of file
@@ -1,15 +1,67 @@
 """
 Data fetcher module for retrieving data from Hasura GraphQL endpoint.
 """
+import time
 import requests
 import pandas as pd
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Any, Tuple
 from config import (
     HASURA_ENDPOINT, HASURA_ADMIN_SECRET,
     ALL_ADMINS_CALL_DATA_QUERY, ALL_CHAT_RATINGS_QUERY, ALL_LEAVE_REQUESTS_QUERY,
-    CALL_DATA_QUERY, CHAT_RATINGS_QUERY, LEAVE_REQUESTS_QUERY
+    CALL_DATA_QUERY, CHAT_RATINGS_QUERY, LEAVE_REQUESTS_QUERY,
+    COMBINED_DATA_QUERY, ADMIN_RANKINGS_QUERY,
+    TOP50_CALL_DATA_QUERY, USE_TOP50_VIEW, USE_RANKING_VIEW
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+# Column sets returned by each table's queries, used to assemble
+# DataFrames column-wise
+CALL_COLUMNS = ('id', 'admin_id', 'admin_name', 'internal_rating',
+                'credentials_delivery_time', 'created_at', 'call_status')
+RATING_COLUMNS = ('id', 'user_id', 'rating', 'created_at', 'operation_status')
+LEAVE_COLUMNS = ('id', 'user_id', 'leave_request', 'leave_request_reason', 'created_at')
+
+# Free-text columns stored as Arrow-backed strings instead of Python
+# objects; the id columns stay categorical for the code-based kernels
+STRING_COLUMNS = ('admin_name', 'call_status', 'operation_status', 'leave_request_reason')
+
+
+def _frame_from_rows(rows: List[Dict[str, Any]], columns: Tuple[str, ...]) -> pd.DataFrame:
+    """
+    Build a DataFrame column-wise from parsed JSON rows.
+
+    Assembling one list per column skips pandas' per-row dict scan when
+    ingesting a list of dicts, and avoids the intermediate row objects.
+
+    Args:
+        rows: Parsed JSON rows from a query response
+        columns: Column names to extract from each row
+
+    Returns:
+        DataFrame with the requested columns
+    """
+    df = pd.DataFrame({col: [row.get(col) for row in rows] for col in columns})
+
+    if _HAS_PYARROW:
+        for col in STRING_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('string[pyarrow]')
+
+    return df
+
 
 class HasuraClient:
     """Client for interacting with Hasura GraphQL API."""
@@ -21,9 +73,21 @@ class HasuraClient:
             'Content-Type': 'application/json',
             'x-hasura-admin-secret': HASURA_ADMIN_SECRET
         }
-        
+
         if not self.endpoint or not HASURA_ADMIN_SECRET:
             raise ValueError("Missing Hasura endpoint or admin secret in environment variables")
+
+        # Reuse one session so keep-alive skips the TCP+TLS handshake
+        # after the first request (big win for parallel/per-admin fetches)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.2)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
     def execute_query(self, query: str, variables: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -45,14 +109,19 @@ class HasuraClient:
         }
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.endpoint,
                 json=payload,
-                headers=self.headers
+                timeout=(5, 30)
             )
             response.raise_for_status()
-            
-            data = response.json()
+
+            # orjson parses large nested responses several times faster
+            # than the stdlib json used by response.json()
+            if orjson is not None:
+                data = orjson.loads(response.content)
+            else:
+                data = response.json()
             if 'errors' in data:
                 raise Exception(f"GraphQL errors: {data['errors']}")
                 
@@ -67,10 +136,28 @@ class HasuraClient:
 class AdminDataFetcher:
     """Fetches and processes admin-related data."""
     
-    def __init__(self):
-        """Initialize the data fetcher."""
+    def __init__(self, cache_ttl: float = 30.0):
+        """
+        Initialize the data fetcher.
+
+        Args:
+            cache_ttl: Seconds to keep fetched data cached in-process
+        """
         self.client = HasuraClient()
-    
+        self.cache_ttl = cache_ttl
+        self._cache = {}
+
+    def _cache_get(self, key) -> Optional[Any]:
+        """Return a cached value if it is still fresh, else None."""
+        hit = self._cache.get(key)
+        if hit is not None and time.time() - hit[1] < self.cache_ttl:
+            return hit[0]
+        return None
+
+    def _cache_put(self, key, value) -> None:
+        """Store a value in the cache with the current timestamp."""
+        self._cache[key] = (value, time.time())
+
     def get_all_call_data(self, limit: int = 1000) -> pd.DataFrame:
         """
         Fetch all call data from whatsub_delivery_time table.
@@ -81,21 +168,36 @@ class AdminDataFetcher:
         Returns:
             DataFrame with call data
         """
+        cached = self._cache_get(('calls', limit))
+        if cached is not None:
+            return cached
+
         try:
-            variables = {'limit': limit}
-            data = self.client.execute_query(ALL_ADMINS_CALL_DATA_QUERY, variables)
-            
-            if not data.get('whatsub_delivery_time'):
+            if USE_TOP50_VIEW:
+                # The view caps the payload at 50 rows per admin, so no
+                # admin starves another under the shared limit
+                data = self.client.execute_query(TOP50_CALL_DATA_QUERY)
+                rows = data.get('whatsub_delivery_time_top50')
+            else:
+                variables = {'limit': limit}
+                data = self.client.execute_query(ALL_ADMINS_CALL_DATA_QUERY, variables)
+                rows = data.get('whatsub_delivery_time')
+
+            if not rows:
                 print("No call data found")
                 return pd.DataFrame()
-            
-            df = pd.DataFrame(data['whatsub_delivery_time'])
-            df['created_at'] = pd.to_datetime(df['created_at'])
-            
+
+            df = _frame_from_rows(rows, CALL_COLUMNS)
+            df['created_at'] = pd.to_datetime(df['created_at'], format='ISO8601', utc=True, cache=True)
+
             # Filter out records with null admin_id
             df = df[df['admin_id'].notna()]
-            
+
+            # Categorical codes make every later groupby/filter int-keyed
+            df['admin_id'] = df['admin_id'].astype('category')
+
             print(f"Fetched {len(df)} call records")
+            self._cache_put(('calls', limit), df)
             return df
             
         except Exception as e:
@@ -112,21 +214,29 @@ class AdminDataFetcher:
         Returns:
             DataFrame with chat ratings
         """
+        cached = self._cache_get(('ratings', limit))
+        if cached is not None:
+            return cached
+
         try:
             variables = {'limit': limit}
             data = self.client.execute_query(ALL_CHAT_RATINGS_QUERY, variables)
-            
+
             if not data.get('whatsub_admin_ratings'):
                 print("No chat ratings found")
                 return pd.DataFrame()
-            
-            df = pd.DataFrame(data['whatsub_admin_ratings'])
-            df['created_at'] = pd.to_datetime(df['created_at'])
-            
+
+            df = _frame_from_rows(data['whatsub_admin_ratings'], RATING_COLUMNS)
+            df['created_at'] = pd.to_datetime(df['created_at'], format='ISO8601', utc=True, cache=True)
+
             # Filter out records with null user_id
             df = df[df['user_id'].notna()]
-            
+
+            # Categorical codes make every later groupby/filter int-keyed
+            df['user_id'] = df['user_id'].astype('category')
+
             print(f"Fetched {len(df)} chat rating records")
+            self._cache_put(('ratings', limit), df)
             return df
             
         except Exception as e:
@@ -140,31 +250,154 @@ class AdminDataFetcher:
         Returns:
             DataFrame with leave requests
         """
+        cached = self._cache_get('leaves')
+        if cached is not None:
+            return cached
+
         try:
             data = self.client.execute_query(ALL_LEAVE_REQUESTS_QUERY)
-            
+
             if not data.get('whatsub_room_user_mapping'):
                 print("No leave requests found")
                 return pd.DataFrame()
-            
-            df = pd.DataFrame(data['whatsub_room_user_mapping'])
-            df['created_at'] = pd.to_datetime(df['created_at'])
-            
+
+            df = _frame_from_rows(data['whatsub_room_user_mapping'], LEAVE_COLUMNS)
+            df['created_at'] = pd.to_datetime(df['created_at'], format='ISO8601', utc=True, cache=True)
+
+            df['user_id'] = df['user_id'].astype('category')
+
             print(f"Fetched {len(df)} leave request records")
+            self._cache_put('leaves', df)
             return df
             
         except Exception as e:
             print(f"Error fetching leave requests: {str(e)}")
             return pd.DataFrame()
     
+    def get_rankings(self) -> pd.DataFrame:
+        """
+        Fetch per-admin window aggregates from the admin_ranking_v view.
+
+        The view computes the 50-call/50-rating averages and the leave
+        count in Postgres, so the response is one row per admin instead
+        of the raw records. Only queried when USE_RANKING_VIEW is set;
+        otherwise (or when the view is not tracked) an empty DataFrame
+        is returned, letting callers fall back to client-side ranking.
+
+        Returns:
+            DataFrame with admin_id, admin_name, cr50, cdt50, r50, lr1m
+        """
+        if not USE_RANKING_VIEW:
+            return pd.DataFrame()
+        try:
+            data = self.client.execute_query(ADMIN_RANKINGS_QUERY)
+
+            if not data.get('admin_ranking_v'):
+                print("No server-side ranking data found")
+                return pd.DataFrame()
+
+            df = pd.DataFrame(data['admin_ranking_v'])
+            print(f"Fetched {len(df)} server-side ranking rows")
+            return df
+
+        except Exception as e:
+            print(f"Server-side rankings unavailable, falling back to raw data: {str(e)}")
+            return pd.DataFrame()
+
+    def fetch_all_bundle(self, limit: int = 1000) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch call data, chat ratings and leave requests in one GraphQL request.
+
+        All three root fields are aliased in a single document, so one
+        round-trip to Hasura replaces three sequential ones.
+
+        Args:
+            limit: Maximum number of records to fetch per table
+
+        Returns:
+            Dictionary containing DataFrames for each data type
+        """
+        cached = self._cache_get(('bundle', limit))
+        if cached is not None:
+            return cached
+
+        result = {
+            'calls': pd.DataFrame(),
+            'ratings': pd.DataFrame(),
+            'leaves': pd.DataFrame()
+        }
+
+        try:
+            variables = {'limit': limit}
+            data = self.client.execute_query(COMBINED_DATA_QUERY, variables)
+
+            if data.get('calls'):
+                df = _frame_from_rows(data['calls'], CALL_COLUMNS)
+                df['created_at'] = pd.to_datetime(df['created_at'], format='ISO8601', utc=True, cache=True)
+                df = df[df['admin_id'].notna()]
+                df['admin_id'] = df['admin_id'].astype('category')
+                result['calls'] = df
+
+            if data.get('ratings'):
+                df = _frame_from_rows(data['ratings'], RATING_COLUMNS)
+                df['created_at'] = pd.to_datetime(df['created_at'], format='ISO8601', utc=True, cache=True)
+                df = df[df['user_id'].notna()]
+                df['user_id'] = df['user_id'].astype('category')
+                result['ratings'] = df
+
+            if data.get('leaves'):
+                df = _frame_from_rows(data['leaves'], LEAVE_COLUMNS)
+                df['created_at'] = pd.to_datetime(df['created_at'], format='ISO8601', utc=True, cache=True)
+                df['user_id'] = df['user_id'].astype('category')
+                result['leaves'] = df
+
+            print(f"Fetched {len(result['calls'])} call, {len(result['ratings'])} rating "
+                  f"and {len(result['leaves'])} leave records in one request")
+            self._cache_put(('bundle', limit), result)
+
+        except Exception as e:
+            print(f"Error fetching combined data: {str(e)}")
+
+        return result
+
+    def fetch_all_parallel(self, limit: int = 1000) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch call data, chat ratings and leave requests concurrently.
+
+        The three requests are independent I/O and the GIL is released
+        inside requests.post, so the round-trips overlap instead of adding
+        up. Useful wherever the per-table fetchers are still needed; the
+        main ranking path uses the combined aliased query instead.
+
+        Args:
+            limit: Maximum number of records to fetch per table
+
+        Returns:
+            Dictionary containing DataFrames for each data type
+        """
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            calls_future = executor.submit(self.get_all_call_data, limit)
+            ratings_future = executor.submit(self.get_all_chat_ratings, limit)
+            leaves_future = executor.submit(self.get_all_leave_requests)
+
+            return {
+                'calls': calls_future.result(),
+                'ratings': ratings_future.result(),
+                'leaves': leaves_future.result()
+            }
+
     def get_admin_specific_data(self, admin_id: str, limit: int = 50) -> Dict[str, pd.DataFrame]:
         """
         Fetch specific admin's data from all tables.
-        
+
+        Deprecated: this makes three per-admin round-trips. Prefer
+        fetch_all_bundle (cached for the TTL) and slicing the admin's
+        rows in-process, as get_admin_detailed_analysis does.
+
         Args:
             admin_id: Admin UUID
             limit: Number of recent records to fetch
-            
+
         Returns:
             Dictionary containing DataFrames for each data type
         """
@@ -179,22 +412,22 @@ class AdminDataFetcher:
             variables = {'limit': limit, 'admin_id': admin_id}
             call_data = self.client.execute_query(CALL_DATA_QUERY, variables)
             if call_data.get('whatsub_delivery_time'):
-                result['calls'] = pd.DataFrame(call_data['whatsub_delivery_time'])
-                result['calls']['created_at'] = pd.to_datetime(result['calls']['created_at'])
+                result['calls'] = _frame_from_rows(call_data['whatsub_delivery_time'], CALL_COLUMNS)
+                result['calls']['created_at'] = pd.to_datetime(result['calls']['created_at'], format='ISO8601', utc=True, cache=True)
             
             # Get chat ratings (using user_id same as admin_id)
             variables = {'limit': limit, 'user_id': admin_id}
             rating_data = self.client.execute_query(CHAT_RATINGS_QUERY, variables)
             if rating_data.get('whatsub_admin_ratings'):
-                result['ratings'] = pd.DataFrame(rating_data['whatsub_admin_ratings'])
-                result['ratings']['created_at'] = pd.to_datetime(result['ratings']['created_at'])
+                result['ratings'] = _frame_from_rows(rating_data['whatsub_admin_ratings'], RATING_COLUMNS)
+                result['ratings']['created_at'] = pd.to_datetime(result['ratings']['created_at'], format='ISO8601', utc=True, cache=True)
             
             # Get leave requests
             variables = {'user_id': admin_id}
             leave_data = self.client.execute_query(LEAVE_REQUESTS_QUERY, variables)
             if leave_data.get('whatsub_room_user_mapping'):
-                result['leaves'] = pd.DataFrame(leave_data['whatsub_room_user_mapping'])
-                result['leaves']['created_at'] = pd.to_datetime(result['leaves']['created_at'])
+                result['leaves'] = _frame_from_rows(leave_data['whatsub_room_user_mapping'], LEAVE_COLUMNS)
+                result['leaves']['created_at'] = pd.to_datetime(result['leaves']['created_at'], format='ISO8601', utc=True, cache=True)
             
         except Exception as e:
             print(f"Error fetching admin-specific data: {str(e)}")
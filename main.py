@@ -50,14 +50,14 @@ def main():
         
         # Save outputs
         print("\n💾 Saving results...")
-        csv_path = output_handler.save_to_csv(rankings_df)
+        rankings_path = output_handler.save_rankings(rankings_df, csv=True)
         report_path = output_handler.save_detailed_report(rankings_df, insights)
         
         # Export top performers
         top_performers = output_handler.export_top_performers(rankings_df, percentile=20)
         
         print(f"\n✅ Process completed successfully!")
-        print(f"   📁 CSV Rankings: {csv_path}")
+        print(f"   📁 Rankings: {rankings_path}")
         print(f"   📄 Detailed Report: {report_path}")
         print(f"   ⭐ Top 20% exported: {len(top_performers)} admins")
         
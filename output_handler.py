@@ -2,17 +2,156 @@
 Output handler for formatting and displaying admin ranking results.
 """
 import pandas as pd
+import numpy as np
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+# Where all reports land; override with the RANKING_OUT environment variable
+OUT_DIR = Path(os.environ.get('RANKING_OUT', '.'))
+OUT_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def _fast_to_xlsx(path: str, sheets: Dict[str, pd.DataFrame]) -> None:
+    """
+    Write DataFrames to an xlsx file using openpyxl's write-only mode.
+
+    Streams rows straight into the sheet instead of building a styled
+    Cell object per value like DataFrame.to_excel, which makes large
+    exports several times faster and keeps memory flat.
+
+    Args:
+        path: Destination .xlsx file path
+        sheets: Mapping of sheet name to DataFrame
+    """
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    for name, df in sheets.items():
+        ws = wb.create_sheet(title=name)
+        ws.append(list(df.columns))
+        clean = df.astype(object).where(df.notna(), None)
+        for row in clean.itertuples(index=False, name=None):
+            ws.append(row)
+    wb.save(path)
+
+
+def _write_csv(df: pd.DataFrame, path: str) -> None:
+    """
+    Write a CSV through Arrow's C++ writer when pyarrow is available.
+
+    Floats are rounded to three decimal places up front, so values keep
+    the old float_format='%.3f' precision, but the files are not
+    byte-identical: Arrow drops trailing zeros (6.47, not 6.470) and
+    quotes string fields. The pandas writer stays as the fallback.
+    """
+    if pa is not None:
+        pacsv.write_csv(pa.Table.from_pandas(df.round(3), preserve_index=False), path)
+    else:
+        df.to_csv(path, index=False, float_format='%.3f')
+
+
+def _below_quantile(names: np.ndarray, values: np.ndarray, q: float = 0.3) -> List[str]:
+    """Return the names whose metric falls below the given quantile."""
+    return names[values < np.quantile(values, q)].tolist()
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{sheet}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+
+def _raw_xlsx_dump(df: pd.DataFrame, path: str, sheet: str = 'Rankings') -> None:
+    """
+    Write a single-sheet xlsx by emitting the SpreadsheetML XML directly.
+
+    Skips openpyxl entirely: numbers go out as <c t="n"> cells and
+    everything else as inline strings, so no per-cell objects or XML
+    tree are built. This is the fastest path for the large flat
+    rankings table; use _fast_to_xlsx for multi-sheet exports.
+
+    Args:
+        df: DataFrame to export
+        path: Destination .xlsx file path
+        sheet: Sheet name shown in the workbook
+    """
+    import zipfile
+    from xml.sax.saxutils import escape
+
+    def cell(value):
+        if value is None or (isinstance(value, float) and value != value):
+            return '<c/>'
+        if isinstance(value, (bool, np.bool_)):
+            return f'<c t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, (int, float, np.integer, np.floating)):
+            return f'<c t="n"><v>{value:.6g}</v></c>'
+        return f'<c t="inlineStr"><is><t>{escape(str(value))}</t></is></c>'
+
+    parts = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+             '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+             '<sheetData>']
+    header = ''.join(cell(str(col)) for col in df.columns)
+    parts.append(f'<row r="1">{header}</row>')
+    for i, row in enumerate(df.itertuples(index=False, name=None), start=2):
+        parts.append(f'<row r="{i}">' + ''.join(cell(v) for v in row) + '</row>')
+    parts.append('</sheetData></worksheet>')
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', _XLSX_CONTENT_TYPES)
+        zf.writestr('_rels/.rels', _XLSX_ROOT_RELS)
+        zf.writestr('xl/workbook.xml', _XLSX_WORKBOOK.format(sheet=escape(sheet)))
+        zf.writestr('xl/_rels/workbook.xml.rels', _XLSX_WORKBOOK_RELS)
+        zf.writestr('xl/worksheets/sheet1.xml', ''.join(parts))
+
 
 class OutputHandler:
     """Handles formatting and output of ranking results."""
     
     def __init__(self):
         """Initialize the output handler."""
-        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.generated_at = datetime.now()
+        self.timestamp = self.generated_at.strftime("%Y%m%d_%H%M%S")
     
     def display_rankings(self, rankings_df: pd.DataFrame, top_n: int = 10) -> None:
         """
@@ -26,21 +165,22 @@ class OutputHandler:
             print("No rankings data to display")
             return
         
-        top_admins = rankings_df.head(top_n)
+        # Partial selection: doesn't assume the frame arrives pre-sorted
+        top_admins = rankings_df.nlargest(top_n, 'lambda_score')
         
         print(f"\n{'='*80}")
         print(f"TOP {top_n} ADMIN RANKINGS BY LAMBDA SCORE")
-        print(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Generated on: {self.generated_at.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*80}")
-        
-        print(f"{'Rank':<5} {'Admin Name':<20} {'Lambda Score':<12} {'CR50':<8} {'1/CDT50':<8} {'R50':<8} {'1/LR1M':<8}")
-        print(f"{'-'*80}")
-        
-        for _, row in top_admins.iterrows():
-            print(f"{row['rank']:<5} {str(row['admin_name'])[:19]:<20} "
-                  f"{row['lambda_score']:<12.3f} {row['cr50']:<8.3f} "
-                  f"{row['cdt50_inverse']:<8.3f} {row['r50']:<8.3f} {row['lr1m_inverse']:<8.3f}")
-        
+
+        display_columns = ['rank', 'admin_name', 'lambda_score',
+                           'cr50', 'cdt50_inverse', 'r50', 'lr1m_inverse']
+        # Truncate long names in one vectorized pass to keep rows narrow
+        top_admins = top_admins.assign(
+            admin_name=top_admins['admin_name'].astype(str).str.slice(0, 19))
+        print(top_admins[display_columns].to_string(
+            index=False, float_format=lambda v: f"{v:.3f}"))
+
         print(f"\nTotal Admins Ranked: {len(rankings_df)}")
         
         # Display summary statistics
@@ -50,36 +190,61 @@ class OutputHandler:
         print(f"Lowest Lambda Score: {rankings_df['lambda_score'].min():.3f}")
         print(f"Standard Deviation: {rankings_df['lambda_score'].std():.3f}")
     
-    def save_to_csv(self, rankings_df: pd.DataFrame, filename: Optional[str] = None) -> str:
+    def save_rankings(self, rankings_df: pd.DataFrame, filename: Optional[str] = None,
+                      csv: bool = False, xlsx: bool = False) -> str:
         """
-        Save rankings to CSV and Excel file.
-        
+        Save rankings to Parquet, with optional CSV and Excel copies.
+
+        Parquet is the primary format: the columnar binary write skips
+        the float-to-string formatting CSV and xlsx pay per cell, and
+        the files are much smaller.
+
         Args:
             rankings_df: DataFrame with admin rankings
             filename: Optional custom filename (without extension)
+            csv: Also write a CSV copy
+            xlsx: Also write an Excel copy
         Returns:
-            Path to saved CSV file
+            Path to saved Parquet file
         """
-        import os
         if filename is None:
             filename = f"admin_rankings_{self.timestamp}"
-        basepath = f"C:\\Users\\chait\\Desktop\\subspaceRanking\\{filename}"
-        csv_path = basepath + ".csv"
-        xlsx_path = basepath + ".xlsx"
+        basepath = str(OUT_DIR / filename)
+        parquet_path = basepath + ".parquet"
         # Reorder columns for better readability
         column_order = [
             'rank', 'admin_id', 'admin_name', 'lambda_score',
             'cr50', 'cdt50_inverse', 'r50', 'lr1m_inverse'
         ]
-        output_df = rankings_df[column_order].copy()
-        output_df.to_csv(csv_path, index=False, float_format='%.3f')
-        try:
-            output_df.to_excel(xlsx_path, index=False, float_format='%.3f')
-            print(f"\nRankings saved to: {csv_path} and {xlsx_path}")
-        except Exception as e:
-            print(f"\nRankings saved to: {csv_path}")
-            print(f"(Excel export failed: {e})")
-        return csv_path
+        output_df = rankings_df[column_order]
+        output_df.to_parquet(parquet_path, engine='pyarrow', compression='zstd')
+        saved = [parquet_path]
+
+        def write_csv():
+            csv_path = basepath + ".csv"
+            _write_csv(output_df, csv_path)
+            saved.append(csv_path)
+
+        def write_xlsx():
+            xlsx_path = basepath + ".xlsx"
+            try:
+                _raw_xlsx_dump(output_df.round(3), xlsx_path)
+                saved.append(xlsx_path)
+            except Exception as e:
+                print(f"(Excel export failed: {e})")
+
+        writers = ([write_csv] if csv else []) + ([write_xlsx] if xlsx else [])
+        if len(writers) > 1:
+            # The writers only read output_df and release the GIL while
+            # compressing, so the formats can be written concurrently
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                for future in [pool.submit(w) for w in writers]:
+                    future.result()
+        else:
+            for writer in writers:
+                writer()
+        print(f"\nRankings saved to: {' and '.join(saved)}")
+        return parquet_path
     
     def save_detailed_report(self, rankings_df: pd.DataFrame, 
                            detailed_analysis: Optional[Dict] = None) -> str:
@@ -94,11 +259,18 @@ class OutputHandler:
             Path to saved report file
         """
         filename = f"admin_ranking_report_{self.timestamp}.json"
-        filepath = f"C:\\Users\\chait\\Desktop\\subspaceRanking\\{filename}"
-        
+        filepath = str(OUT_DIR / filename)
+
+        # Keep the JSON small: the full table goes to a parquet sidecar
+        # instead of one dict per row via to_dict('records')
+        rankings_file = None
+        if not rankings_df.empty:
+            rankings_file = filepath[:-len('.json')] + '_rankings.parquet'
+            rankings_df.to_parquet(rankings_file, engine='pyarrow', compression='zstd')
+
         report_data = {
             'metadata': {
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': self.generated_at.isoformat(),
                 'total_admins': len(rankings_df),
                 'formula_used': 'lambda = cr50 + 1/cdt50 + r50 + 1/lr1m',
                 'data_source': 'Hasura GraphQL - db.subspace.money'
@@ -113,13 +285,17 @@ class OutputHandler:
                 'avg_r50': float(rankings_df['r50'].mean()),
                 'avg_lr1m_inverse': float(rankings_df['lr1m_inverse'].mean())
             },
-            'rankings': rankings_df.to_dict('records'),
+            'rankings_file': rankings_file,
             'detailed_analysis': detailed_analysis
         }
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False, default=str)
-        
+
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(report_data, option=orjson.OPT_INDENT_2, default=str))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(report_data, f, indent=2, ensure_ascii=False, default=str)
+
         print(f"Detailed report saved to: {filepath}")
         return filepath
     
@@ -152,27 +328,22 @@ class OutputHandler:
         print(f"  Average Chat Rating: {statistics['avg_chat_rating']:.3f}")
 
         # Export all records to Excel for this admin
-        import pandas as pd
-        from datetime import datetime
         admin_id = lambda_metrics['admin_id']
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"admin_{admin_id}_details_{timestamp}.xlsx"
-        filepath = f"C:\\Users\\chait\\Desktop\\subspaceRanking\\{filename}"
+        filename = f"admin_{admin_id}_details_{self.timestamp}.xlsx"
+        filepath = str(OUT_DIR / filename)
         def remove_tz(df):
-            for col in df.columns:
-                if pd.api.types.is_datetime64_any_dtype(df[col]):
-                    df[col] = df[col].dt.tz_localize(None)
+            tz_cols = df.select_dtypes(include=['datetimetz']).columns
+            if len(tz_cols):
+                df[tz_cols] = df[tz_cols].apply(lambda s: s.dt.tz_localize(None))
             return df
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-            calls_df = pd.DataFrame(analysis_data['recent_calls'])
-            ratings_df = pd.DataFrame(analysis_data['recent_ratings'])
-            leaves_df = pd.DataFrame(analysis_data['recent_leaves'])
-            calls_df = remove_tz(calls_df)
-            ratings_df = remove_tz(ratings_df)
-            leaves_df = remove_tz(leaves_df)
-            calls_df.to_excel(writer, sheet_name='Calls', index=False)
-            ratings_df.to_excel(writer, sheet_name='ChatRatings', index=False)
-            leaves_df.to_excel(writer, sheet_name='Leaves', index=False)
+        calls_df = remove_tz(pd.DataFrame.from_records(analysis_data['recent_calls'] or []))
+        ratings_df = remove_tz(pd.DataFrame.from_records(analysis_data['recent_ratings'] or []))
+        leaves_df = remove_tz(pd.DataFrame.from_records(analysis_data['recent_leaves'] or []))
+        _fast_to_xlsx(filepath, {
+            'Calls': calls_df,
+            'ChatRatings': ratings_df,
+            'Leaves': leaves_df
+        })
         print(f"\nAll detailed records exported to: {filepath}")
     
     def export_top_performers(self, rankings_df: pd.DataFrame, 
@@ -186,18 +357,19 @@ class OutputHandler:
         Returns:
             DataFrame with top performers
         """
-        import os
         if rankings_df.empty:
             return pd.DataFrame()
         top_count = max(1, int(len(rankings_df) * (percentile / 100)))
-        top_performers = rankings_df.head(top_count)
+        # Don't assume the caller pre-sorted the frame
+        rankings_df = rankings_df.sort_values('lambda_score', ascending=False, kind='stable')
+        top_performers = rankings_df.iloc[:top_count]
         filename = f"top_{percentile}_percent_admins_{self.timestamp}"
-        basepath = f"C:\\Users\\chait\\Desktop\\subspaceRanking\\{filename}"
+        basepath = str(OUT_DIR / filename)
         csv_path = basepath + ".csv"
         xlsx_path = basepath + ".xlsx"
-        top_performers.to_csv(csv_path, index=False, float_format='%.3f')
+        _write_csv(top_performers, csv_path)
         try:
-            top_performers.to_excel(xlsx_path, index=False, float_format='%.3f')
+            _fast_to_xlsx(xlsx_path, {'TopPerformers': top_performers.round(3)})
             print(f"\nTop {percentile}% performers ({top_count} admins) saved to: {csv_path} and {xlsx_path}")
         except Exception as e:
             print(f"\nTop {percentile}% performers ({top_count} admins) saved to: {csv_path}")
@@ -217,25 +389,30 @@ class OutputHandler:
         if rankings_df.empty:
             return {}
         
+        # One quantile computation and one searchsorted pass replace the
+        # four quantile calls and repeated boolean masks
+        scores = rankings_df['lambda_score'].to_numpy()
+        thresholds = np.quantile(scores, [0.4, 0.6, 0.8])
+        buckets = np.bincount(np.searchsorted(thresholds, scores, side='right'), minlength=4)
+        names = rankings_df['admin_name'].to_numpy()
+
         insights = {
             'performance_distribution': {
-                'excellent': len(rankings_df[rankings_df['lambda_score'] >= rankings_df['lambda_score'].quantile(0.8)]),
-                'good': len(rankings_df[(rankings_df['lambda_score'] >= rankings_df['lambda_score'].quantile(0.6)) & 
-                                      (rankings_df['lambda_score'] < rankings_df['lambda_score'].quantile(0.8))]),
-                'average': len(rankings_df[(rankings_df['lambda_score'] >= rankings_df['lambda_score'].quantile(0.4)) & 
-                                         (rankings_df['lambda_score'] < rankings_df['lambda_score'].quantile(0.6))]),
-                'below_average': len(rankings_df[rankings_df['lambda_score'] < rankings_df['lambda_score'].quantile(0.4)])
+                'excellent': int(buckets[3]),
+                'good': int(buckets[2]),
+                'average': int(buckets[1]),
+                'below_average': int(buckets[0])
             },
             'component_analysis': {
-                'strongest_in_call_rating': rankings_df.loc[rankings_df['cr50'].idxmax()]['admin_name'] if not rankings_df.empty else 'N/A',
-                'fastest_delivery': rankings_df.loc[rankings_df['cdt50_inverse'].idxmax()]['admin_name'] if not rankings_df.empty else 'N/A',
-                'best_chat_rating': rankings_df.loc[rankings_df['r50'].idxmax()]['admin_name'] if not rankings_df.empty else 'N/A',
-                'highest_availability': rankings_df.loc[rankings_df['lr1m_inverse'].idxmax()]['admin_name'] if not rankings_df.empty else 'N/A'
+                'strongest_in_call_rating': names[rankings_df['cr50'].to_numpy().argmax()],
+                'fastest_delivery': names[rankings_df['cdt50_inverse'].to_numpy().argmax()],
+                'best_chat_rating': names[rankings_df['r50'].to_numpy().argmax()],
+                'highest_availability': names[rankings_df['lr1m_inverse'].to_numpy().argmax()]
             },
             'improvement_opportunities': {
-                'low_call_ratings': rankings_df[rankings_df['cr50'] < rankings_df['cr50'].quantile(0.3)]['admin_name'].tolist(),
-                'slow_delivery': rankings_df[rankings_df['cdt50_inverse'] < rankings_df['cdt50_inverse'].quantile(0.3)]['admin_name'].tolist(),
-                'low_chat_ratings': rankings_df[rankings_df['r50'] < rankings_df['r50'].quantile(0.3)]['admin_name'].tolist()
+                'low_call_ratings': _below_quantile(names, rankings_df['cr50'].to_numpy()),
+                'slow_delivery': _below_quantile(names, rankings_df['cdt50_inverse'].to_numpy()),
+                'low_chat_ratings': _below_quantile(names, rankings_df['r50'].to_numpy())
             }
         }
         
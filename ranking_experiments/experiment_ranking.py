@@ -20,70 +20,85 @@ WEIGHTS = {
 MAX_DELIVERY_TIME = 60.0
 
 
-def normalize_rating(val, max_val=5.0):
-    return min(val / max_val, 1.0) if val is not None else 0.0
+def normalize_rating(vals, max_val=5.0):
+    arr = np.nan_to_num(np.asarray(vals, dtype=float))
+    return np.minimum(arr / max_val, 1.0)
 
-def normalize_delivery_time(avg_time):
-    if avg_time is None or avg_time <= 0:
-        return 1.0
-    norm = min(MAX_DELIVERY_TIME / avg_time, 1.0)
+def normalize_delivery_time(avg_times):
+    arr = np.asarray(avg_times, dtype=float)
+    norm = np.ones_like(arr)
+    positive = arr > 0
+    norm[positive] = np.minimum(MAX_DELIVERY_TIME / arr[positive], 1.0)
     return norm
 
-def normalize_leaves(leave_count):
-    return min(1.0, 1.0 / (leave_count + 1))
+def normalize_leaves(leave_counts):
+    arr = np.asarray(leave_counts, dtype=float)
+    return np.minimum(1.0, 1.0 / (arr + 1.0))
 
 
 def calculate_experiment_lambda(cr50, r50, cdt50, lr1m):
+    """Score whole columns at once; every argument is array-like."""
     cr50_norm = normalize_rating(cr50)
     r50_norm = normalize_rating(r50)
     cdt50_norm = normalize_delivery_time(cdt50)
     lr1m_norm = normalize_leaves(lr1m)
-    score = (
-        WEIGHTS['cr50'] * cr50_norm +
-        WEIGHTS['r50'] * r50_norm +
-        WEIGHTS['cdt50'] * cdt50_norm +
-        WEIGHTS['lr1m'] * lr1m_norm
-    )
-    return score, cr50_norm, r50_norm, cdt50_norm, lr1m_norm
+    features = np.stack([cr50_norm, r50_norm, cdt50_norm, lr1m_norm], axis=1)
+    weights = np.array([WEIGHTS['cr50'], WEIGHTS['r50'], WEIGHTS['cdt50'], WEIGHTS['lr1m']])
+    scores = features @ weights
+    return scores, cr50_norm, r50_norm, cdt50_norm, lr1m_norm
 
 
 def run_experiment():
     fetcher = AdminDataFetcher()
-    call_data = fetcher.get_all_call_data()
-    rating_data = fetcher.get_all_chat_ratings()
-    leave_data = fetcher.get_all_leave_requests()
+    bundle = fetcher.fetch_all_parallel()
+    call_data = bundle['calls']
+    rating_data = bundle['ratings']
+    leave_data = bundle['leaves']
     if call_data.empty:
         print("No call data available.")
         return
-    admin_ids = call_data['admin_id'].unique()
-    results = []
-    for admin_id in admin_ids:
-        admin_calls = call_data[call_data['admin_id'] == admin_id].sort_values('created_at', ascending=False).head(50)
-        cr50 = admin_calls['internal_rating'].dropna().mean() if not admin_calls.empty else 0.0
-        cdt50 = admin_calls['credentials_delivery_time'].dropna().mean() if not admin_calls.empty else MAX_DELIVERY_TIME
-        admin_ratings = rating_data[rating_data['user_id'] == admin_id].sort_values('created_at', ascending=False).head(50)
-        r50 = admin_ratings['rating'].dropna().mean() if not admin_ratings.empty else 0.0
-        if leave_data.empty or 'user_id' not in leave_data.columns:
-            lr1m = 0
-        else:
-            admin_leaves = leave_data[leave_data['user_id'] == admin_id]
-            lr1m = len(admin_leaves)
-        score, cr50_norm, r50_norm, cdt50_norm, lr1m_norm = calculate_experiment_lambda(cr50, r50, cdt50, lr1m)
-        admin_name = admin_calls['admin_name'].iloc[0] if not admin_calls.empty else 'Unknown'
-        results.append({
-            'admin_id': admin_id,
-            'admin_name': admin_name,
-            'exp_lambda_score': score,
-            'cr50': cr50,
-            'cr50_norm': cr50_norm,
-            'r50': r50,
-            'r50_norm': r50_norm,
-            'cdt50': cdt50,
-            'cdt50_norm': cdt50_norm,
-            'lr1m': lr1m,
-            'lr1m_norm': lr1m_norm
-        })
-    df = pd.DataFrame(results)
+
+    # One sort + one groupby pass per table instead of a full scan per admin
+    call_data = call_data.sort_values('created_at', ascending=False)
+    top_calls = call_data.groupby('admin_id', sort=False, observed=True).head(50)
+    agg = top_calls.groupby('admin_id', sort=False, observed=True).agg(
+        cr50=('internal_rating', 'mean'),
+        cdt50=('credentials_delivery_time', 'mean'),
+        admin_name=('admin_name', 'first')
+    )
+    agg['cr50'] = agg['cr50'].fillna(0.0)
+    agg['cdt50'] = agg['cdt50'].fillna(MAX_DELIVERY_TIME)
+    agg['admin_name'] = agg['admin_name'].fillna('Unknown')
+
+    if not rating_data.empty:
+        rating_data = rating_data.sort_values('created_at', ascending=False)
+        r50 = rating_data.groupby('user_id', sort=False, observed=True).head(50) \
+                         .groupby('user_id', sort=False, observed=True)['rating'].mean()
+    else:
+        r50 = pd.Series(dtype=float)
+    agg['r50'] = r50.reindex(agg.index).fillna(0.0)
+
+    if leave_data.empty or 'user_id' not in leave_data.columns:
+        leave_counts = pd.Series(dtype=int)
+    else:
+        leave_counts = leave_data['user_id'].value_counts()
+    agg['lr1m'] = leave_counts.reindex(agg.index).fillna(0).astype(int)
+
+    scores, cr50_norm, r50_norm, cdt50_norm, lr1m_norm = calculate_experiment_lambda(
+        agg['cr50'], agg['r50'], agg['cdt50'], agg['lr1m'])
+    df = pd.DataFrame({
+        'admin_id': agg.index,
+        'admin_name': agg['admin_name'].to_numpy(),
+        'exp_lambda_score': scores,
+        'cr50': agg['cr50'].to_numpy(),
+        'cr50_norm': cr50_norm,
+        'r50': agg['r50'].to_numpy(),
+        'r50_norm': r50_norm,
+        'cdt50': agg['cdt50'].to_numpy(),
+        'cdt50_norm': cdt50_norm,
+        'lr1m': agg['lr1m'].to_numpy(),
+        'lr1m_norm': lr1m_norm
+    })
     df = df.sort_values('exp_lambda_score', ascending=False).reset_index(drop=True)
     df['rank'] = df.index + 1
     out_base = os.path.join(os.path.dirname(__file__), 'experiment_admin_rankings')
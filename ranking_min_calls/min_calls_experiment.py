@@ -45,13 +45,27 @@ def calculate_experiment_lambda(cr50, r50, cdt50, lr1m):
 
 def run_experiment():
     fetcher = AdminDataFetcher()
-    call_data = fetcher.get_all_call_data()
-    rating_data = fetcher.get_all_chat_ratings()
-    leave_data = fetcher.get_all_leave_requests()
+    bundle = fetcher.fetch_all_parallel()
+    call_data = bundle['calls']
+    rating_data = bundle['ratings']
+    leave_data = bundle['leaves']
     if call_data.empty:
         print("No call data available.")
         return
     admin_ids = call_data['admin_id'].unique()
+    # One pass over the leave frame instead of a full scan per admin
+    if leave_data.empty or 'user_id' not in leave_data.columns:
+        leave_counts = {}
+    else:
+        leave_counts = leave_data['user_id'].value_counts().to_dict()
+    # Same treatment for ratings: sort once, then one groupby pass for
+    # the per-admin mean over the 50 most recent ratings
+    if rating_data.empty:
+        r50_map = {}
+    else:
+        rating_data = rating_data.sort_values('created_at', ascending=False, kind='stable')
+        r50_map = rating_data.groupby('user_id', sort=False, observed=True).head(50) \
+                             .groupby('user_id', sort=False, observed=True)['rating'].mean().to_dict()
     results = []
     for admin_id in admin_ids:
         admin_calls = call_data[call_data['admin_id'] == admin_id].sort_values('created_at', ascending=False)
@@ -61,13 +75,8 @@ def run_experiment():
         admin_calls = admin_calls.head(MAX_CALLS)  # Always use most recent 10
         cr50 = admin_calls['internal_rating'].dropna().mean() if not admin_calls.empty else 0.0
         cdt50 = admin_calls['credentials_delivery_time'].dropna().mean() if not admin_calls.empty else MAX_DELIVERY_TIME
-        admin_ratings = rating_data[rating_data['user_id'] == admin_id].sort_values('created_at', ascending=False).head(50)
-        r50 = admin_ratings['rating'].dropna().mean() if not admin_ratings.empty else 0.0
-        if leave_data.empty or 'user_id' not in leave_data.columns:
-            lr1m = 0
-        else:
-            admin_leaves = leave_data[leave_data['user_id'] == admin_id]
-            lr1m = len(admin_leaves)
+        r50 = r50_map.get(admin_id, 0.0)
+        lr1m = leave_counts.get(admin_id, 0)
         score, cr50_norm, r50_norm, cdt50_norm, lr1m_norm = calculate_experiment_lambda(cr50, r50, cdt50, lr1m)
         admin_name = admin_calls['admin_name'].iloc[0] if not admin_calls.empty else 'Unknown'
         results.append({